@@ -1,8 +1,35 @@
 """Tests for TokenTracker core functionality."""
 
+import subprocess
+import sys
+import types
+
 import pytest
+import tokentracker.tracker as tracker_module
 from tokentracker.tracker import TokenTracker
-from tokentracker.models import SUPPORTED_MODELS
+from tokentracker.models import SUPPORTED_MODELS, MODEL_ALIASES, TokenUsage
+
+
+def _clear_count_caches():
+    tracker_module._get_counter.cache_clear()
+    tracker_module._encode_len_cached.cache_clear()
+    tracker_module._digest_counts.clear()
+
+
+@pytest.fixture
+def offline_encoding(monkeypatch):
+    """Serve a small byte-level tiktoken encoding instead of downloading vocabularies."""
+    tiktoken = pytest.importorskip("tiktoken")
+    encoding = tiktoken.Encoding(
+        "offline_bytes",
+        pat_str=r"""'s|'t|'re|'ve|'m|'ll|'d| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+""",
+        mergeable_ranks={bytes([i]): i for i in range(256)},
+        special_tokens={"<|endoftext|>": 256},
+    )
+    monkeypatch.setattr(tracker_module, "_get_encoding", lambda name: encoding)
+    _clear_count_caches()
+    yield encoding
+    _clear_count_caches()
 
 
 class TestTokenTracker:
@@ -21,6 +48,33 @@ class TestTokenTracker:
         assert tracker.model_name == "unknown-model"
         assert tracker.model_config.max_tokens == 4096  # Default fallback
     
+    def test_encoding_shared_across_trackers(self, monkeypatch):
+        """Test that trackers using the same encoding share one encoder."""
+        loaded = []
+        backend = types.ModuleType("fake_backend")
+        backend.get_encoding = lambda name: loaded.append(name) or object()
+        monkeypatch.setitem(sys.modules, "fake_backend", backend)
+        monkeypatch.setattr(tracker_module, "_TOKENIZER_BACKENDS", ("fake_backend",))
+        tracker_module._get_encoding.cache_clear()
+        try:
+            gpt = TokenTracker("gpt-4")
+            claude = TokenTracker("claude-3-haiku")
+        finally:
+            tracker_module._get_encoding.cache_clear()
+        
+        assert gpt.model_config.encoding_name == claude.model_config.encoding_name
+        assert gpt.encoding is not None
+        assert gpt.encoding is claude.encoding
+        assert loaded == ["cl100k_base"]
+    
+    def test_model_alias(self):
+        """Test that versioned model names resolve to their base config."""
+        tracker = TokenTracker("gpt-4-0613")
+        assert tracker.model_name == "gpt-4-0613"
+        assert tracker.model_config is SUPPORTED_MODELS["gpt-4"]
+        assert TokenTracker.get_model_info("gpt-4-0613") is SUPPORTED_MODELS["gpt-4"]
+        assert "gpt-4-0613" in TokenTracker.list_supported_models()
+    
     def test_count_tokens_basic(self):
         """Test basic token counting."""
         tracker = TokenTracker()
@@ -28,11 +82,118 @@ class TestTokenTracker:
         # Test empty string
         assert tracker.count_tokens("") == 0
         
+        # Test single characters
+        assert tracker.count_tokens("a") == 1
+        assert tracker.count_tokens(" ") == 1
+        
         # Test simple text
         count = tracker.count_tokens("Hello, world!")
         assert count > 0
         assert isinstance(count, int)
     
+    def test_count_tokens_prefers_count_ordinary(self, monkeypatch):
+        """Test that a backend's count_ordinary is used instead of encoding."""
+        class CountingEncoding:
+            def count_ordinary(self, text):
+                return 42
+            
+            def encode(self, text):
+                raise AssertionError("materialized the token ids")
+        
+        monkeypatch.setattr(tracker_module, "_get_encoding", lambda name: CountingEncoding())
+        _clear_count_caches()
+        try:
+            assert TokenTracker().count_tokens("Hello, world!") == 42
+        finally:
+            _clear_count_caches()
+    
+    def test_count_tokens_special_token_text(self, offline_encoding):
+        """Test that special-token text in content is counted exactly as ordinary text."""
+        tracker = TokenTracker()
+        
+        text = "Documents end with <|endoftext|> in the training data."
+        with pytest.raises(ValueError):
+            offline_encoding.encode(text)
+        assert tracker.count_tokens(text) == len(offline_encoding.encode_ordinary(text))
+        assert tracker.count_tokens_batch([text] * 20) == [tracker.count_tokens(text)] * 20
+    
+    def test_long_texts_cached_by_digest(self, offline_encoding, monkeypatch):
+        """Test that long texts are memoized by digest in a bounded LRU."""
+        monkeypatch.setattr(tracker_module, "_DIGEST_CACHE_SIZE", 2)
+        tracker = TokenTracker()
+        
+        texts = [f"Document {i}. " + "word " * 500 for i in range(3)]
+        for text in texts:
+            assert tracker.count_tokens(text) == len(offline_encoding.encode_ordinary(text))
+        tracker.count_tokens("A short text")
+        
+        # The oldest entry was evicted, and short texts aren't digested
+        keys = [("cl100k_base", tracker_module._content_digest(text)) for text in texts]
+        assert list(tracker_module._digest_counts) == keys[1:]
+        
+        # Hits are served without encoding again, and become most recently used
+        with monkeypatch.context() as patched:
+            patched.setattr(
+                tracker_module, "_get_counter", lambda name: lambda text: pytest.fail("encoded again")
+            )
+            assert tracker.count_tokens(texts[1]) == len(offline_encoding.encode_ordinary(texts[1]))
+        assert list(tracker_module._digest_counts) == [keys[2], keys[1]]
+    
+    @pytest.mark.parametrize("module", ["tokentracker._numba_approx", "tokentracker._numpy_approx"])
+    def test_fast_approximation_matches_regex(self, module, monkeypatch):
+        """Test that the compiled and vectorized approximations agree with the regex heuristic."""
+        fast = pytest.importorskip(module)
+        monkeypatch.setattr("tokentracker.tracker._get_fast_approximation", lambda length: None)
+        tracker = TokenTracker()
+        
+        texts = [
+            "Hello, world!",
+            "internationalization of extraordinarily long_identifiers_here",
+            "tabs\tand\nnewlines\x1cseparators -- (punctuation)!? 12345678901234",
+            "trailingword",
+            "Paragraph, with some words_and_underscores; and punctuation... " * 20,
+        ]
+        for text in texts:
+            expected = max(1, tracker._approximate_token_count(text))
+            assert max(1, fast.approximate_ascii_token_count(text)) == expected
+    
+    def test_fast_approximation_not_loaded_for_short_texts(self):
+        """Test that short texts don't pay for importing numba or numpy."""
+        code = (
+            "import sys\n"
+            "from tokentracker import TokenTracker\n"
+            "TokenTracker()._approximate_token_count('A sentence of well over thirty-two characters.')\n"
+            "assert 'tokentracker._numba_approx' not in sys.modules\n"
+            "assert 'tokentracker._numpy_approx' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+    
+    def test_count_tokens_batch(self):
+        """Test batch token counting matches counting texts one by one."""
+        tracker = TokenTracker()
+        
+        texts = ["", "a", "Hello, world!"] + [f"Sentence number {i}." for i in range(100)]
+        assert tracker.count_tokens_batch(texts) == [tracker.count_tokens(t) for t in texts]
+        assert tracker.count_tokens_batch([]) == []
+    
+    def test_count_tokens_batch_sharded(self, offline_encoding, monkeypatch):
+        """Test that large batches sharded across the pool match encoding one by one."""
+        monkeypatch.setattr(tracker_module, "_BATCH_WORKERS", 4)
+        shard_sizes = []
+        count_shard = tracker_module._count_shard
+        monkeypatch.setattr(
+            tracker_module,
+            "_count_shard",
+            lambda count, texts: shard_sizes.append(len(texts)) or count_shard(count, texts),
+        )
+        tracker = TokenTracker()
+        
+        texts = [f"Sentence number {i}, with some text." for i in range(100)]
+        assert tracker.count_tokens_batch(texts) == [
+            len(offline_encoding.encode_ordinary(text)) for text in texts
+        ]
+        assert shard_sizes == [25, 25, 25, 25]
+    
     def test_count_tokens_from_messages(self):
         """Test counting tokens from messages."""
         tracker = TokenTracker()
@@ -49,6 +210,95 @@ class TestTokenTracker:
         content_only = tracker.count_tokens("Hello!") + tracker.count_tokens("Hi there!")
         assert count > content_only
     
+    def test_count_tokens_from_messages_non_openai(self):
+        """Test that message content is counted for non-OpenAI models."""
+        tracker = TokenTracker("claude-3-haiku")
+        
+        messages = [
+            {"role": "user", "content": "Hello!"},
+            {"role": "assistant", "content": "Hi there!"}
+        ]
+        
+        content_only = tracker.count_tokens("Hello!") + tracker.count_tokens("Hi there!")
+        assert tracker.count_tokens_from_messages(messages) == content_only
+    
+    def test_count_tokens_from_messages_large_batch(self):
+        """Test that batched counting matches counting messages one at a time."""
+        tracker = TokenTracker()
+        
+        messages = [
+            {"role": "user", "content": f"Message number {i}, with some text."}
+            for i in range(40)
+        ]
+        
+        expected = sum(tracker.count_tokens(m["content"]) + 4 for m in messages) + 2
+        assert tracker.count_tokens_from_messages(messages) == expected
+    
+    def test_count_tokens_from_messages_inexact(self):
+        """Test the single-encode estimate stays close to the exact count."""
+        tracker = TokenTracker()
+        
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant."},
+            {"role": "user", "content": "What is AI?", "name": "example_user"},
+            {"role": "assistant", "content": "AI stands for Artificial Intelligence."}
+        ]
+        
+        exact = tracker.count_tokens_from_messages(messages)
+        estimate = tracker.count_tokens_from_messages(messages, exact=False)
+        assert abs(estimate - exact) <= len(messages)
+        assert tracker.count_tokens_from_messages([], exact=False) == 2
+        
+        # Assistant tool-call messages have no content
+        tool_call = [{"role": "user", "content": "call it"}, {"role": "assistant", "content": None}]
+        exact = tracker.count_tokens_from_messages(tool_call)
+        assert abs(tracker.count_tokens_from_messages(tool_call, exact=False) - exact) <= len(tool_call)
+    
+    def test_count_tokens_per_message(self):
+        """Test per-message counts add up to the conversation total."""
+        tracker = TokenTracker()
+        
+        messages = [
+            {"role": "user", "content": "What is AI?", "name": "example_user"},
+            {"role": "assistant", "content": "AI stands for Artificial Intelligence."}
+        ]
+        
+        counts = tracker.count_tokens_per_message(messages)
+        assert counts[1] == tracker.count_tokens(messages[1]["content"]) + 4
+        assert sum(counts) + tracker.conversation_overhead == tracker.count_tokens_from_messages(messages)
+    
+    def test_count_tokens_from_messages_reuses_cached_counts(self):
+        """Test that re-counting a growing conversation reuses earlier counts."""
+        tracker = TokenTracker()
+        
+        messages = [{"role": "user", "content": "Hello!"}]
+        first = tracker.count_tokens_from_messages(messages)
+        assert "Hello!" in tracker._message_token_cache
+        
+        messages.append({"role": "assistant", "content": "Hi there!"})
+        second = tracker.count_tokens_from_messages(messages)
+        assert second > first
+        assert second == TokenTracker().count_tokens_from_messages(messages)
+        
+        tracker.reset()
+        assert not tracker._message_token_cache
+    
+    def test_message_token_cache_is_bounded(self, monkeypatch):
+        """Test that the message cache evicts old contents and digests long ones."""
+        monkeypatch.setattr(tracker_module, "_MESSAGE_CACHE_SIZE", 4)
+        tracker = TokenTracker()
+        
+        long_content = "word " * 1000
+        messages = [{"role": "user", "content": f"Message number {i}."} for i in range(10)]
+        messages.append({"role": "user", "content": long_content})
+        expected = TokenTracker().count_tokens_from_messages(messages)
+        
+        assert tracker.count_tokens_from_messages(messages) == expected
+        assert len(tracker._message_token_cache) == 4
+        assert long_content not in tracker._message_token_cache
+        assert "Message number 9." in tracker._message_token_cache
+        assert tracker.count_tokens_from_messages(messages) == expected
+    
     def test_track_prompt(self):
         """Test prompt tracking."""
         tracker = TokenTracker()
@@ -72,6 +322,67 @@ class TestTokenTracker:
         assert usage.completion_tokens > 0
         assert usage.total_tokens == usage.prompt_tokens + usage.completion_tokens
     
+    def test_track(self):
+        """Test tracking a prompt and completion together."""
+        tracker = TokenTracker()
+        
+        usage = tracker.track("Test prompt", "This is a response")
+        
+        separate = TokenTracker()
+        separate.track_prompt("Test prompt")
+        expected = separate.track_completion("This is a response")
+        
+        assert usage == expected
+        assert tracker.track("Another prompt").completion_tokens == usage.completion_tokens
+    
+    def test_snapshot(self):
+        """Test that track methods return live usage and snapshots are copies."""
+        tracker = TokenTracker()
+        
+        usage = tracker.track_prompt("Test prompt")
+        snapshot = tracker.snapshot()
+        assert usage is tracker.session_usage
+        assert snapshot == usage
+        
+        tracker.track_completion("This is a response")
+        assert usage.completion_tokens > 0
+        assert snapshot.completion_tokens == 0
+        
+        # Snapshots equal the live usage whatever the model's limit
+        for model in ["claude-3-haiku", "gpt-4-turbo", "gpt-3.5-turbo-16k"]:
+            tracker = TokenTracker(model)
+            for _ in range(200):
+                tracker.track_tokens(prompt_tokens=7)
+                assert tracker.snapshot() == tracker.session_usage
+    
+    def test_track_tokens(self):
+        """Test tracking precomputed token counts."""
+        tracker = TokenTracker()
+        
+        usage = tracker.track_tokens(prompt_tokens=10, completion_tokens=5)
+        assert usage.prompt_tokens == 10
+        assert usage.completion_tokens == 5
+        assert usage.total_tokens == 15
+    
+    def test_track_completion_stream(self):
+        """Test tracking a streamed completion chunk by chunk."""
+        tracker = TokenTracker()
+        tracker.track_prompt("Test prompt")
+        
+        with tracker.track_completion_stream() as stream:
+            for chunk in ["This ", "is ", "a ", "streamed ", "response"]:
+                stream.feed(chunk)
+        
+        expected = TokenTracker().count_tokens("This is a streamed response")
+        assert stream.usage is not None
+        assert stream.usage.completion_tokens == expected
+        assert tracker.session_usage.completion_tokens == expected
+        
+        # Closing again doesn't track the completion twice
+        assert stream.close().completion_tokens == expected
+        with pytest.raises(ValueError):
+            stream.feed("more")
+    
     def test_track_conversation(self):
         """Test conversation tracking."""
         tracker = TokenTracker()
@@ -128,6 +439,22 @@ class TestTokenTracker:
         warning = tracker.get_warning_message()
         assert warning is not None
         assert "warning" in warning.lower()
+        
+        # Non-finite thresholds compare like the usage ratio would
+        assert not tracker.is_near_limit(float("nan"))
+        assert not tracker.is_near_limit(float("inf"))
+        assert tracker.is_near_limit(float("-inf"))
+        
+        # Thresholds past float precision, or whose limit overflows a float
+        assert not tracker.is_near_limit(1e20)
+        assert not tracker.is_near_limit(1e308)
+        
+        # Only a few non-default thresholds are remembered
+        for i in range(100):
+            tracker.is_near_limit(i / 100)
+            tracker.is_near_limit(float("nan"))
+        assert len(tracker._threshold_tokens) == tracker_module._THRESHOLD_CACHE_SIZE
+        assert tracker.is_near_limit(threshold=0.8)
     
     def test_cost_estimation(self):
         """Test cost estimation for models with pricing."""
@@ -156,6 +483,12 @@ class TestTokenTracker:
         unknown_info = TokenTracker.get_model_info("nonexistent-model")
         assert unknown_info is None
     
+    def test_token_usage_derived_fields(self):
+        """Test that TokenUsage derives its totals on construction."""
+        usage = TokenUsage(model_name="x", max_tokens=100, prompt_tokens=10, completion_tokens=5)
+        assert usage.total_tokens == 15
+        assert usage.percentage_used == 15.0
+    
     def test_percentage_calculation(self):
         """Test percentage usage calculation."""
         tracker = TokenTracker()
@@ -179,6 +512,12 @@ class TestModelConfigurations:
             assert config.provider
             # cost_per_1k_tokens is optional
     
+    def test_aliases_point_to_supported_models(self):
+        """Test that every alias resolves to a configured model."""
+        for alias, model_name in MODEL_ALIASES.items():
+            assert alias not in SUPPORTED_MODELS
+            assert model_name in SUPPORTED_MODELS
+    
     def test_model_providers(self):
         """Test that models have expected providers."""
         openai_models = [name for name, config in SUPPORTED_MODELS.items() 
@@ -4,7 +4,7 @@ TokenTracker - Track context lengths for LLMs so you know when you're close to t
 
 __version__ = "0.1.0"
 
-from .tracker import TokenTracker
+from .tracker import TokenTracker, CompletionStream
 from .models import TokenUsage, ModelConfig
 
-__all__ = ["TokenTracker", "TokenUsage", "ModelConfig"]
\ No newline at end of file
+__all__ = ["TokenTracker", "CompletionStream", "TokenUsage", "ModelConfig"]
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""Numba-compiled version of the approximate token count.
+
+The fastest tier of TokenTracker's fallback path; requires the ``fast`` extra
+(numba and numpy). Scans the text's bytes in a single compiled loop, classifying
+them with the ASCII table in ``_numpy_approx._ASCII_CLASSES``, so it shares the
+vectorized tier's ASCII-only restriction.
+"""
+
+import numpy as np
+from numba import njit
+
+from ._numpy_approx import _ASCII_CLASSES, _PUNCT, _WORD
+
+
+@njit(cache=True)
+def _count_ascii(buf: np.ndarray, classes: np.ndarray) -> int:
+    """Count words, long-word bonuses and punctuation in one pass over bytes."""
+    estimated_tokens = 0
+    word_length = 0
+    for byte in buf:
+        char_class = classes[byte]
+        if char_class == _WORD:
+            word_length += 1
+            continue
+        if word_length:
+            estimated_tokens += 1 + (word_length // 6 if word_length > 6 else 0)
+            word_length = 0
+        if char_class == _PUNCT:
+            estimated_tokens += 1
+    if word_length:
+        estimated_tokens += 1 + (word_length // 6 if word_length > 6 else 0)
+    return estimated_tokens
+
+
+def approximate_ascii_token_count(text: str) -> int:
+    """Approximate token count of an ASCII string (without the minimum of 1)."""
+    buf = np.frombuffer(text.encode("ascii"), dtype=np.uint8)
+    return int(_count_ascii(buf, _ASCII_CLASSES))
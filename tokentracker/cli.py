@@ -2,16 +2,29 @@
 
 import click
 import sys
-from typing import List, Dict, Any
-from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from rich.progress import Progress, BarColumn, TextColumn
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate, islice
+from typing import TYPE_CHECKING, List, Dict, Any, Tuple, Type
 
 from .tracker import TokenTracker
 from .models import SUPPORTED_MODELS
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+
+# Messages tokenized per batch when analyzing a conversation file
+_ANALYZE_CHUNK_SIZE = 1000
+
+# Rich is imported inside the commands that render with it, so `--help`,
+# `--version` and library users importing this module don't pay its import cost.
+
+
+@lru_cache(maxsize=None)
+def _get_console() -> "Console":
+    """Get the shared Rich console, creating it on first use."""
+    from rich.console import Console
+    return Console()
 
 
 @click.group()
@@ -27,6 +40,11 @@ def main() -> None:
 @click.option('--file', '-f', type=click.File('r'), help='Read text from file')
 def count(text: str, model: str, file) -> None:
     """Count tokens in text or file."""
+    from rich.table import Table
+    from rich.panel import Panel
+    
+    console = _get_console()
+    
     if file:
         text = file.read()
     elif not text:
@@ -72,6 +90,7 @@ def count(text: str, model: str, file) -> None:
 @click.option('--model', '-m', default='gpt-3.5-turbo', help='Model to use for token counting')
 def interactive(model: str) -> None:
     """Interactive token tracking session."""
+    console = _get_console()
     tracker = TokenTracker(model)
     console.print(f"[green]Started interactive session with {model}[/green]")
     console.print("Commands: /count <text>, /reset, /status, /quit")
@@ -87,7 +106,7 @@ def interactive(model: str) -> None:
                 tracker.reset()
                 console.print("[green]Session reset[/green]")
             elif user_input == "/status":
-                usage = tracker._get_current_usage()
+                usage = tracker.snapshot()
                 _display_usage_status(usage, tracker)
             elif user_input.startswith("/count "):
                 text = user_input[7:]  # Remove "/count "
@@ -111,6 +130,8 @@ def interactive(model: str) -> None:
 @main.command()
 def models() -> None:
     """List supported models and their configurations."""
+    from rich.table import Table
+    
     table = Table(title="Supported Models")
     table.add_column("Model Name", style="cyan")
     table.add_column("Provider", style="yellow")
@@ -126,50 +147,92 @@ def models() -> None:
             cost
         )
     
-    console.print(table)
+    _get_console().print(table)
 
 
 @main.command()
-@click.argument('file', type=click.File('r'))
+@click.argument('file', type=click.File('rb'))
 @click.option('--model', '-m', default='gpt-3.5-turbo', help='Model to use for token counting')
 def analyze(file, model: str) -> None:
     """Analyze token usage of a conversation file (JSON format)."""
     import json
     
+    console = _get_console()
+    
+    # Stream messages with ijson when it is installed, so memory stays bounded
+    # by one chunk of messages instead of the whole file
     try:
-        data = json.load(file)
-        tracker = TokenTracker(model)
-        
-        if isinstance(data, list) and all(isinstance(msg, dict) for msg in data):
-            # Assume it's a list of messages
-            usage = tracker.track_conversation(data)
-            
-            console.print(f"[green]Analyzed conversation with {len(data)} messages[/green]")
-            _display_usage_status(usage, tracker)
-            
+        import ijson
+    except ImportError:
+        ijson = None
+    parse_errors: Tuple[Type[Exception], ...] = (json.JSONDecodeError,)
+    if ijson is not None:
+        parse_errors += (ijson.JSONError,)
+    
+    tracker = TokenTracker(model)
+    message_counts: List[int] = []
+    
+    try:
+        if ijson is not None:
+            events = ijson.parse(file)
+            is_array = next(events, (None, None, None))[1] == 'start_array'
+            messages = ijson.items(events, 'item') if is_array else iter(())
         else:
-            console.print("[red]Error: File should contain a JSON array of message objects[/red]")
-            sys.exit(1)
+            data = json.load(file)
+            is_array = isinstance(data, list)
+            messages = iter(data) if is_array else iter(())
+        
+        is_message_list = is_array
+        while is_message_list:
+            chunk = list(islice(messages, _ANALYZE_CHUNK_SIZE))
+            if not chunk:
+                break
+            if not all(isinstance(msg, dict) for msg in chunk):
+                is_message_list = False
+                break
+            message_counts.extend(tracker.count_tokens_per_message(chunk))
             
-    except json.JSONDecodeError as e:
+    except parse_errors as e:
         console.print(f"[red]Error parsing JSON: {e}[/red]")
         sys.exit(1)
+    
+    if not is_message_list:
+        console.print("[red]Error: File should contain a JSON array of message objects[/red]")
+        sys.exit(1)
+    
+    usage = tracker.track_tokens(
+        prompt_tokens=sum(message_counts) + tracker.conversation_overhead
+    )
+    
+    console.print(f"[green]Analyzed conversation with {len(message_counts)} messages[/green]")
+    _display_usage_status(usage, tracker)
+    
+    # Find the first message whose running total overflows the context window
+    running_totals = list(accumulate(message_counts, initial=tracker.conversation_overhead))[1:]
+    overflow_at = bisect_right(running_totals, usage.max_tokens)
+    if overflow_at < len(running_totals):
+        console.print(
+            f"[red]Context limit exceeded at message {overflow_at + 1} "
+            f"of {len(message_counts)}[/red]"
+        )
 
 
 def _display_usage_status(usage, tracker) -> None:
     """Display current usage status with progress bar."""
-    # Progress bar
-    with Progress(
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-    ) as progress:
-        task = progress.add_task(
-            f"Token Usage ({usage.model_name})",
-            total=usage.max_tokens,
-            completed=usage.total_tokens
-        )
-        progress.update(task, advance=0)  # Just to display it
+    from rich.table import Table
+    from rich.panel import Panel
+    from rich.progress_bar import ProgressBar
+    
+    console = _get_console()
+    
+    # Progress bar, printed once rather than through a live-refreshing Progress
+    bar = Table.grid(padding=(0, 1))
+    bar.add_row(
+        f"[progress.description]Token Usage ({usage.model_name})",
+        ProgressBar(total=usage.max_tokens, completed=usage.total_tokens, width=40),
+        f"[progress.percentage]{usage.percentage_used:>3.0f}%",
+    )
+    console.print(bar)
     
     # Detailed info
     table = Table(show_header=False, box=None)
@@ -1,11 +1,12 @@
 """Data models for TokenTracker."""
 
+import sys
 from dataclasses import dataclass
-from typing import Optional, Dict, Any
-from pydantic import BaseModel, model_validator
+from typing import Optional, Dict, Any, Tuple
 
 
-class ModelConfig(BaseModel):
+@dataclass(frozen=True)
+class ModelConfig:
     """Configuration for an LLM model."""
     
     name: str
@@ -15,24 +16,28 @@ class ModelConfig(BaseModel):
     cost_per_1k_tokens: Optional[float] = None
     
     
-class TokenUsage(BaseModel):
-    """Token usage information."""
+@dataclass
+class TokenUsage:
+    """Token usage information.
     
+    ``total_tokens`` and ``percentage_used`` are derived on construction.
+    :class:`~tokentracker.tracker.TokenTracker` keeps them up to date as it
+    tracks more tokens into its session usage.
+    """
+    
+    model_name: str
+    max_tokens: int
     prompt_tokens: int = 0
     completion_tokens: int = 0
     total_tokens: int = 0
-    model_name: str
-    max_tokens: int
     percentage_used: float = 0.0
     cost_estimate: Optional[float] = None
     
-    @model_validator(mode='after')
-    def calculate_derived_fields(self):
+    def __post_init__(self) -> None:
         """Calculate derived fields."""
         self.total_tokens = self.prompt_tokens + self.completion_tokens
         if self.max_tokens > 0:
             self.percentage_used = (self.total_tokens / self.max_tokens) * 100
-        return self
 
 
 # Pre-defined model configurations
@@ -96,4 +101,33 @@ SUPPORTED_MODELS = {
         provider="anthropic",
         cost_per_1k_tokens=0.00025
     ),
-}
\ No newline at end of file
+}
+
+
+# Versioned model names that share a configuration with a base model above
+MODEL_ALIASES: Dict[str, str] = {
+    # OpenAI GPT Models
+    "gpt-4-0314": "gpt-4",
+    "gpt-4-0613": "gpt-4",
+    "gpt-4-32k-0314": "gpt-4-32k",
+    "gpt-4-32k-0613": "gpt-4-32k",
+    "gpt-4-turbo-2024-04-09": "gpt-4-turbo",
+    "gpt-4-turbo-preview": "gpt-4-turbo",
+    "gpt-3.5-turbo-0613": "gpt-3.5-turbo",
+    "gpt-3.5-turbo-16k-0613": "gpt-3.5-turbo-16k",
+    
+    # Anthropic Claude Models
+    "claude-3-opus-20240229": "claude-3-opus",
+    "claude-3-sonnet-20240229": "claude-3-sonnet",
+    "claude-3-haiku-20240307": "claude-3-haiku",
+}
+
+# Intern model names so lookups with names taken from these tables (alias
+# targets, config.name, CLI choices) match keys by identity before comparing
+SUPPORTED_MODELS = {sys.intern(name): config for name, config in SUPPORTED_MODELS.items()}
+MODEL_ALIASES = {
+    sys.intern(alias): sys.intern(model_name) for alias, model_name in MODEL_ALIASES.items()
+}
+
+# Every name accepted by TokenTracker, computed once for list_supported_models
+SUPPORTED_MODEL_NAMES: Tuple[str, ...] = tuple(SUPPORTED_MODELS) + tuple(MODEL_ALIASES)
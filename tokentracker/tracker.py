@@ -1,14 +1,222 @@
 """Core TokenTracker implementation."""
 
-import tiktoken
+import copy
+import hashlib
+import importlib
+import io
+import math
+import os
 import re
-from typing import List, Optional, Dict, Any, Union
-from .models import TokenUsage, ModelConfig, SUPPORTED_MODELS
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+from itertools import repeat
+from typing import Callable, List, Optional, Dict, Any, Tuple, Union
+from .models import (
+    TokenUsage,
+    ModelConfig,
+    SUPPORTED_MODELS,
+    MODEL_ALIASES,
+    SUPPORTED_MODEL_NAMES,
+)
+
+
+# Below this many texts, encoding one by one beats spinning up encode_batch's pool
+_MIN_BATCH_SIZE = 16
+
+# Batches at least this large are sharded across a thread pool shared by all
+# trackers, instead of starting a new pool per encode_batch call
+_PARALLEL_BATCH_SIZE = 64
+_BATCH_WORKERS = os.cpu_count() or 1
+
+# Backends whose batch encode is parallel natively (riptoken fans out to rayon
+# with the GIL released), so sharding it across the pool only adds overhead
+_NATIVE_BATCH_BACKENDS = ("riptoken",)
+
+# Tokenizer backends to try, in order of preference. Each must expose a
+# tiktoken-compatible ``get_encoding(name)``; if none loads, trackers fall
+# back to the regex approximation. riptoken is an optional, faster drop-in
+# for tiktoken's Rust core that produces identical tokens.
+_TOKENIZER_BACKENDS = ("riptoken", "tiktoken")
+
+# Texts at least this long are memoized by content digest rather than by the text
+_DIGEST_KEY_MIN_LENGTH = 2048
+_DIGEST_CACHE_SIZE = 1024
+_digest_counts: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+_digest_counts_lock = threading.Lock()
+
+# Most distinct message contents each tracker remembers the token counts of
+_MESSAGE_CACHE_SIZE = 1024
+
+# Most non-default is_near_limit thresholds each tracker remembers the limit of
+_THRESHOLD_CACHE_SIZE = 8
+
+# Joins message contents for the single-encode estimate in
+# count_tokens_from_messages(exact=False); a single token in cl100k_base
+_MESSAGE_SEPARATOR = "\n\n"
+
+# Patterns for the approximate token count. A greedy \w+ match is always a
+# whole word, so word-boundary anchors would only add work.
+_WORD_RE = re.compile(r'\w+')
+_PUNCT_RE = re.compile(r'[^\w\s]')
+
+# Faster versions of the approximate token count, fastest first: the module,
+# the text length from which it beats the regex once loaded, and the length at
+# which a single text pays for loading it. Loading numba and its compiled code
+# takes over half a second, and numpy about a tenth of one, against ~90ns per
+# character for the regex; short-lived processes such as one CLI command would
+# otherwise spend far more on the import than they save.
+_FAST_APPROX_TIERS = (
+    ("tokentracker._numba_approx", 32, 1 << 23),
+    ("tokentracker._numpy_approx", 512, 1 << 21),
+)
+_FAST_APPROX_MIN_LENGTH = min(min_length for _, min_length, _ in _FAST_APPROX_TIERS)
+
+
+@lru_cache(maxsize=16)
+def _get_encoding(encoding_name: str) -> Optional[Any]:
+    """Load an encoding once and share it across all trackers.
+
+    Loading an encoding parses its BPE merge table, which is far more expensive
+    than counting tokens with it. Failures (e.g. no backend installed, or no
+    network to fetch the vocabulary) are cached as ``None`` so the
+    approximation fallback doesn't retry for every new tracker.
+    """
+    for backend in _TOKENIZER_BACKENDS:
+        try:
+            module = importlib.import_module(backend)
+            return module.get_encoding(encoding_name)
+        except Exception:
+            # Backend missing or unable to load this encoding - try the next
+            continue
+    return None
+
+
+@lru_cache(maxsize=16)
+def _get_counter(encoding_name: str) -> Callable[[str], int]:
+    """Get the cheapest way to count tokens with a shared encoding.
+
+    Counted texts are message contents, never ChatML framing, so special tokens
+    are encoded as ordinary text rather than checked for. Backends that can
+    count without materializing the token ids expose ``count_ordinary``.
+    """
+    encoding = _get_encoding(encoding_name)
+    if encoding is None:
+        raise ValueError(f"Encoding {encoding_name!r} is not available")
+    
+    count_ordinary: Optional[Callable[[str], int]] = getattr(encoding, "count_ordinary", None)
+    if count_ordinary is not None:
+        return count_ordinary
+    
+    encode: Callable[[str], List[int]]
+    if hasattr(encoding, "encode_ordinary"):
+        encode = encoding.encode_ordinary
+    else:
+        encode = encoding.encode
+    return lambda text: len(encode(text))
+
+
+def _content_digest(text: str) -> bytes:
+    """Digest a text's content, to key caches without keeping the text alive."""
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+
+@lru_cache(maxsize=4096)
+def _encode_len_cached(encoding_name: str, text: str) -> int:
+    """Count tokens with a shared encoding, memoized by the text itself."""
+    return _get_counter(encoding_name)(text)
+
+
+def _encode_len(encoding_name: str, text: str) -> int:
+    """Count tokens with a shared encoding, memoized by content.
+
+    System prompts and repeated turns are counted again and again across
+    trackers, so identical strings are only encoded once per encoding. Long
+    texts are keyed by a digest of their content instead, so the cache doesn't
+    keep large prompts and documents alive.
+    """
+    if len(text) < _DIGEST_KEY_MIN_LENGTH:
+        return _encode_len_cached(encoding_name, text)
+    
+    key = (encoding_name, _content_digest(text))
+    with _digest_counts_lock:
+        count = _digest_counts.get(key)
+        if count is not None:
+            _digest_counts.move_to_end(key)
+            return count
+    
+    count = _get_counter(encoding_name)(text)
+    with _digest_counts_lock:
+        _digest_counts[key] = count
+        if len(_digest_counts) > _DIGEST_CACHE_SIZE:
+            _digest_counts.popitem(last=False)
+    return count
+
+
+@lru_cache(maxsize=None)
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the thread pool shared by all trackers for parallel batch counting."""
+    return ThreadPoolExecutor(max_workers=_BATCH_WORKERS, thread_name_prefix="tokentracker")
+
+
+def _count_shard(count: Callable[[str], int], texts: List[str]) -> List[int]:
+    """Count tokens for one shard of a batch; the encoder releases the GIL."""
+    return [count(text) for text in texts]
+
+
+@lru_cache(maxsize=None)
+def _load_fast_approximation(module_name: str) -> Optional[Callable[[str], int]]:
+    """Import a faster approximation, if its optional dependencies are installed."""
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        return None
+    approximate: Callable[[str], int] = module.approximate_ascii_token_count
+    return approximate
+
+
+def _get_fast_approximation(length: int) -> Optional[Callable[[str], int]]:
+    """Get the fastest approximation worth using on an ASCII text of this length.
+
+    Prefers the numba-compiled version from the ``fast`` extra, then the
+    numpy-vectorized one. Each is imported on first use, by a text long enough
+    to pay for the import; once loaded, it's used from its per-call break-even.
+    """
+    for module_name, min_length, load_min_length in _FAST_APPROX_TIERS:
+        if length >= min_length and (module_name in sys.modules or length >= load_min_length):
+            approximate = _load_fast_approximation(module_name)
+            if approximate is not None:
+                return approximate
+    return None
 
 
 class TokenTracker:
     """Track token usage for LLM interactions."""
     
+    __slots__ = (
+        "model_name",
+        "model_config",
+        "encoding",
+        "use_tiktoken",
+        "session_usage",
+        "_encoding_name",
+        "_max_tokens",
+        "_provider_is_openai",
+        "_inv_max_tokens_pct",
+        "_cost_per_token",
+        "_message_token_cache",
+        "_tokens_per_message",
+        "_tokens_per_name",
+        "_conversation_overhead",
+        "_default_threshold_tokens",
+        "_threshold_tokens",
+        "_shard_batches",
+        "__weakref__",
+    )
+    
     def __init__(self, model_name: str = "gpt-3.5-turbo"):
         """Initialize TokenTracker with a specific model.
         
@@ -18,32 +226,60 @@ class TokenTracker:
         self.model_name = model_name
         self.model_config = self._get_model_config(model_name)
         
+        # Plain-attribute copies of the (frozen) config fields used on hot paths
+        self._encoding_name = self.model_config.encoding_name
+        self._max_tokens = self.model_config.max_tokens
+        self._provider_is_openai = self.model_config.provider == "openai"
+        
+        # Reciprocals, so per-call statistics multiply instead of divide
+        self._inv_max_tokens_pct = 100.0 / self._max_tokens
+        self._cost_per_token = (self.model_config.cost_per_1k_tokens or 0.0) / 1000.0
+        
         # Try to get the tiktoken encoding, fall back to approximation if no network
-        try:
-            self.encoding = tiktoken.get_encoding(self.model_config.encoding_name)
-            self.use_tiktoken = True
-        except Exception:
-            # Network or other error - use approximation
-            self.encoding = None
-            self.use_tiktoken = False
+        self.encoding = _get_encoding(self._encoding_name)
+        self.use_tiktoken = self.encoding is not None
+        self._shard_batches = (
+            self.use_tiktoken
+            and _BATCH_WORKERS > 1
+            and type(self.encoding).__module__.partition(".")[0] not in _NATIVE_BATCH_BACKENDS
+        )
+        
+        # Token counts of recently seen message contents, so re-tracking a
+        # growing conversation only tokenizes the new turns. Least recently
+        # used entries are evicted, and long contents are keyed by digest.
+        self._message_token_cache: "OrderedDict[Union[str, bytes], int]" = OrderedDict()
+        
+        # Message formatting overhead, fixed for the tracker's lifetime. This is
+        # an approximation based on OpenAI's token counting; other providers
+        # only count message content.
+        self._tokens_per_message = 4 if self._provider_is_openai else 0
+        self._tokens_per_name = -1
+        self._conversation_overhead = 2 if self._provider_is_openai else 0
+        
+        # Token totals at which is_near_limit thresholds are reached: the
+        # default's is computed up front, and a few others are kept in an LRU
+        self._default_threshold_tokens = self._tokens_for_threshold(0.8)
+        self._threshold_tokens: "OrderedDict[float, float]" = OrderedDict()
             
         self.session_usage = TokenUsage(
             model_name=model_name,
-            max_tokens=self.model_config.max_tokens
+            max_tokens=self._max_tokens
         )
         
     def _get_model_config(self, model_name: str) -> ModelConfig:
         """Get configuration for a model."""
-        if model_name in SUPPORTED_MODELS:
-            return SUPPORTED_MODELS[model_name]
-        else:
-            # Default fallback for unknown models
-            return ModelConfig(
-                name=model_name,
-                max_tokens=4096,
-                encoding_name="cl100k_base",
-                provider="unknown"
-            )
+        model_name = MODEL_ALIASES.get(model_name, model_name)
+        config = SUPPORTED_MODELS.get(model_name)
+        if config is not None:
+            return config
+        
+        # Default fallback for unknown models
+        return ModelConfig(
+            name=model_name,
+            max_tokens=4096,
+            encoding_name="cl100k_base",
+            provider="unknown"
+        )
     
     def count_tokens(self, text: str) -> int:
         """Count tokens in a text string.
@@ -56,10 +292,15 @@ class TokenTracker:
         """
         if not text:
             return 0
+        
+        # Byte-level BPE vocabularies hold every single byte as its own token,
+        # so a lone ASCII character (e.g. a streamed chunk) is always 1 token
+        if len(text) == 1 and text.isascii():
+            return 1
             
         if self.use_tiktoken:
             try:
-                return len(self.encoding.encode(text))
+                return _encode_len(self._encoding_name, text)
             except Exception:
                 # Fall back to approximation if tiktoken fails
                 pass
@@ -67,6 +308,44 @@ class TokenTracker:
         # Approximation method when tiktoken is not available
         return self._approximate_token_count(text)
     
+    def count_tokens_batch(self, texts: List[str]) -> List[int]:
+        """Count tokens for several texts at once.
+        
+        Large batches are encoded in parallel with the GIL released: the
+        largest are split into one shard per CPU on a shared thread pool
+        (unless the backend's batch call is already natively parallel), and
+        mid-sized ones go through a single ``encode_ordinary_batch`` call.
+        Below ``_MIN_BATCH_SIZE`` texts, dispatching to a pool costs more than
+        it saves, so texts are counted one at a time.
+        
+        Args:
+            texts: The texts to count tokens for
+            
+        Returns:
+            Number of tokens in each text, in the same order
+        """
+        if self._shard_batches and len(texts) >= _PARALLEL_BATCH_SIZE:
+            shard_size = -(-len(texts) // _BATCH_WORKERS)
+            shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+            try:
+                counts = _get_executor().map(_count_shard, repeat(_get_counter(self._encoding_name)), shards)
+                return [count for shard in counts for count in shard]
+            except Exception:
+                # Fall back to counting one text at a time
+                pass
+        
+        encode_batch = getattr(self.encoding, "encode_ordinary_batch", None)
+        if encode_batch is None:
+            encode_batch = getattr(self.encoding, "encode_batch", None)
+        if encode_batch is not None and len(texts) >= _MIN_BATCH_SIZE:
+            try:
+                return [len(ids) for ids in encode_batch(texts)]
+            except Exception:
+                # Fall back to counting one text at a time
+                pass
+        
+        return [self.count_tokens(text) for text in texts]
+    
     def _approximate_token_count(self, text: str) -> int:
         """Approximate token count using simple heuristics.
         
@@ -76,14 +355,21 @@ class TokenTracker:
         if not text:
             return 0
         
+        # Same heuristic compiled with numba or vectorized with numpy, for long
+        # texts it handles exactly
+        if len(text) >= _FAST_APPROX_MIN_LENGTH and text.isascii():
+            fast_approximation = _get_fast_approximation(len(text))
+            if fast_approximation is not None:
+                return max(1, fast_approximation(text))
+        
         # Split on whitespace and punctuation
-        words = re.findall(r'\b\w+\b', text)
+        words = _WORD_RE.findall(text)
         
         # Count words, punctuation, and spaces
         word_count = len(words)
         
         # Account for punctuation and special characters
-        punctuation_count = len(re.findall(r'[^\w\s]', text))
+        punctuation_count = len(_PUNCT_RE.findall(text))
         
         # Rough approximation: most words are 1 token, some are 2+
         # Add punctuation as separate tokens
@@ -96,33 +382,110 @@ class TokenTracker:
         
         return max(1, estimated_tokens)  # At least 1 token for non-empty text
     
-    def count_tokens_from_messages(self, messages: List[Dict[str, str]]) -> int:
+    @property
+    def conversation_overhead(self) -> int:
+        """Tokens added once per conversation by the message format."""
+        return self._conversation_overhead
+    
+    def count_tokens_from_messages(
+        self, messages: List[Dict[str, str]], exact: bool = True
+    ) -> int:
         """Count tokens in a list of messages (ChatML format).
         
         Args:
             messages: List of message dictionaries with 'role' and 'content'
+            exact: Count each message's content separately. If False, contents
+                are joined and encoded in a single call, which is faster for
+                long conversations but can be off by a few tokens where text
+                merges across message boundaries
             
         Returns:
             Total number of tokens including message formatting overhead
         """
+        if not exact:
+            return self._estimate_messages_tokens(messages)
+        return sum(self.count_tokens_per_message(messages)) + self._conversation_overhead
+    
+    def _estimate_messages_tokens(self, messages: List[Dict[str, str]]) -> int:
+        """Count message tokens by encoding all contents joined together."""
         total_tokens = 0
+        if messages:
+            joined = _MESSAGE_SEPARATOR.join(message.get('content') or '' for message in messages)
+            total_tokens = self.count_tokens(joined)
+            # The separator is one token for BPE encodings, and whitespace adds
+            # nothing to the approximation
+            if self.use_tiktoken:
+                total_tokens = max(0, total_tokens - (len(messages) - 1))
+        
+        # Add overhead for message formatting
+        total_tokens += self._tokens_per_message * len(messages)
+        if self._provider_is_openai:
+            names = [message['name'] for message in messages if message.get('name')]
+            if names:
+                total_tokens += sum(self.count_tokens_batch(names))
+                total_tokens += self._tokens_per_name * len(names)
+        total_tokens += self._conversation_overhead
         
-        for message in messages:
-            # Count tokens in content
-            content_tokens = self.count_tokens(message.get('content', ''))
+        return total_tokens
+    
+    def count_tokens_per_message(self, messages: List[Dict[str, str]]) -> List[int]:
+        """Count tokens for each message in a list of messages (ChatML format).
+        
+        Args:
+            messages: List of message dictionaries with 'role' and 'content'
             
-            # Add overhead for message formatting
-            # This is an approximation based on OpenAI's token counting
-            if self.model_config.provider == "openai":
-                total_tokens += content_tokens + 4  # message overhead
+        Returns:
+            Number of tokens in each message including its formatting
+            overhead, in the same order. The conversation-level overhead (see
+            conversation_overhead) is not included.
+        """
+        if self._provider_is_openai:
+            return self._count_message_tokens_openai(messages)
+        return self._count_message_tokens_generic(messages)
+    
+    def _count_message_tokens_openai(self, messages: List[Dict[str, str]]) -> List[int]:
+        """Count tokens for each message in OpenAI's ChatML framing."""
+        contents = [message.get('content') or '' for message in messages]
+        names = [message['name'] for message in messages if message.get('name')]
+        content_counts = self._cached_token_counts(contents + names)
+        name_counts = iter(content_counts[len(contents):])
+        
+        # Add overhead for message formatting
+        counts = [count + self._tokens_per_message for count in content_counts[:len(contents)]]
+        if names:
+            for i, message in enumerate(messages):
                 if message.get('name'):
-                    total_tokens += self.count_tokens(message['name']) - 1
+                    counts[i] += next(name_counts) + self._tokens_per_name
         
-        # Add conversation overhead
-        if self.model_config.provider == "openai":
-            total_tokens += 2  # conversation overhead
-            
-        return total_tokens
+        return counts
+    
+    def _count_message_tokens_generic(self, messages: List[Dict[str, str]]) -> List[int]:
+        """Count tokens for each message's content only."""
+        return self._cached_token_counts([message.get('content') or '' for message in messages])
+    
+    def _cached_token_counts(self, texts: List[str]) -> List[int]:
+        """Count tokens for each text, tokenizing the not-yet-seen ones in a single batch call."""
+        cache = self._message_token_cache
+        keys = [text if len(text) < _DIGEST_KEY_MIN_LENGTH else _content_digest(text) for text in texts]
+        
+        counts: Dict[Union[str, bytes], int] = {}
+        missing: Dict[Union[str, bytes], str] = {}
+        for key, text in zip(keys, texts):
+            count = cache.get(key)
+            if count is None:
+                missing[key] = text
+            else:
+                cache.move_to_end(key)
+                counts[key] = count
+        
+        if missing:
+            counts.update(zip(missing, self.count_tokens_batch(list(missing.values()))))
+            for key in missing:
+                cache[key] = counts[key]
+            while len(cache) > _MESSAGE_CACHE_SIZE:
+                cache.popitem(last=False)
+        
+        return [counts[key] for key in keys]
     
     def track_prompt(self, text: str) -> TokenUsage:
         """Track tokens for a prompt.
@@ -131,12 +494,9 @@ class TokenTracker:
             text: The prompt text
             
         Returns:
-            TokenUsage object with updated statistics
+            The session's live TokenUsage; see snapshot()
         """
-        tokens = self.count_tokens(text)
-        self.session_usage.prompt_tokens += tokens
-        self._update_usage_stats()
-        return self._get_current_usage()
+        return self.track_tokens(prompt_tokens=self.count_tokens(text))
     
     def track_completion(self, text: str) -> TokenUsage:
         """Track tokens for a completion/response.
@@ -145,65 +505,106 @@ class TokenTracker:
             text: The completion text
             
         Returns:
-            TokenUsage object with updated statistics
+            The session's live TokenUsage; see snapshot()
         """
-        tokens = self.count_tokens(text)
-        self.session_usage.completion_tokens += tokens
-        self._update_usage_stats()
-        return self._get_current_usage()
+        return self.track_tokens(completion_tokens=self.count_tokens(text))
+    
+    def track(self, prompt: str, completion: Optional[str] = None) -> TokenUsage:
+        """Track tokens for a prompt and its completion in one call.
+        
+        Equivalent to calling track_prompt() then track_completion(), but
+        updates the usage statistics only once.
+        
+        Args:
+            prompt: The prompt text
+            completion: The completion text, if any
+            
+        Returns:
+            The session's live TokenUsage; see snapshot()
+        """
+        return self.track_tokens(
+            prompt_tokens=self.count_tokens(prompt),
+            completion_tokens=self.count_tokens(completion) if completion else 0
+        )
     
-    def track_conversation(self, messages: List[Dict[str, str]]) -> TokenUsage:
+    def track_completion_stream(self) -> "CompletionStream":
+        """Track a streamed completion, counting its tokens once when it ends.
+        
+        Feeding chunks only buffers them; the full text is encoded in one call
+        on close, instead of once per chunk with track_completion().
+        
+        Returns:
+            CompletionStream to feed chunks into; usable as a context manager
+        """
+        return CompletionStream(self)
+    
+    def track_conversation(
+        self, messages: List[Dict[str, str]], exact: bool = True
+    ) -> TokenUsage:
         """Track tokens for an entire conversation.
         
         Args:
             messages: List of message dictionaries
+            exact: Count messages separately; see count_tokens_from_messages
             
         Returns:
-            TokenUsage object with conversation statistics
+            The session's live TokenUsage; see snapshot()
         """
-        tokens = self.count_tokens_from_messages(messages)
         # For conversations, we count everything as prompt tokens
-        self.session_usage.prompt_tokens += tokens
-        self._update_usage_stats()
-        return self._get_current_usage()
+        tokens = self.count_tokens_from_messages(messages, exact=exact)
+        return self.track_tokens(prompt_tokens=tokens)
+    
+    def track_tokens(self, prompt_tokens: int = 0, completion_tokens: int = 0) -> TokenUsage:
+        """Track token counts that were already computed.
+        
+        Args:
+            prompt_tokens: Number of prompt tokens to add
+            completion_tokens: Number of completion tokens to add
+            
+        Returns:
+            The session's live TokenUsage; see snapshot()
+        """
+        # Nothing to add (e.g. empty streamed chunks) - the stats are unchanged
+        if prompt_tokens or completion_tokens:
+            self.session_usage.prompt_tokens += prompt_tokens
+            self.session_usage.completion_tokens += completion_tokens
+            self._update_usage_stats()
+        return self.session_usage
     
     def _update_usage_stats(self) -> None:
         """Update calculated statistics."""
-        self.session_usage.total_tokens = (
-            self.session_usage.prompt_tokens + self.session_usage.completion_tokens
-        )
-        self.session_usage.percentage_used = (
-            (self.session_usage.total_tokens / self.model_config.max_tokens) * 100
-        )
+        usage = self.session_usage
+        usage.total_tokens = usage.prompt_tokens + usage.completion_tokens
+        usage.percentage_used = usage.total_tokens * self._inv_max_tokens_pct
         
         # Calculate cost estimate if pricing is available
-        if self.model_config.cost_per_1k_tokens:
-            self.session_usage.cost_estimate = (
-                (self.session_usage.total_tokens / 1000) * self.model_config.cost_per_1k_tokens
-            )
+        if self._cost_per_token:
+            usage.cost_estimate = usage.total_tokens * self._cost_per_token
     
-    def _get_current_usage(self) -> TokenUsage:
-        """Get current usage statistics."""
-        return TokenUsage(
-            prompt_tokens=self.session_usage.prompt_tokens,
-            completion_tokens=self.session_usage.completion_tokens,
-            total_tokens=self.session_usage.total_tokens,
-            model_name=self.model_name,
-            max_tokens=self.model_config.max_tokens,
-            percentage_used=self.session_usage.percentage_used,
-            cost_estimate=self.session_usage.cost_estimate
-        )
+    def snapshot(self) -> TokenUsage:
+        """Get a copy of the current usage statistics.
+        
+        The track methods return the session's live TokenUsage, which keeps
+        changing as more tokens are tracked (until reset() starts a new
+        session). Take a snapshot to keep the statistics at a given point.
+        
+        Returns:
+            TokenUsage object that later tracking doesn't modify
+        """
+        # A plain copy, so the derived fields aren't recomputed differently
+        return copy.copy(self.session_usage)
     
     def reset(self) -> None:
         """Reset the session token usage."""
+        self._message_token_cache.clear()
         self.session_usage = TokenUsage(
             model_name=self.model_name,
-            max_tokens=self.model_config.max_tokens
+            max_tokens=self._max_tokens
         )
     
     def get_remaining_tokens(self) -> int:
         """Get the number of tokens remaining before hitting the limit."""
-        return max(0, self.model_config.max_tokens - self.session_usage.total_tokens)
+        return max(0, self._max_tokens - self.session_usage.total_tokens)
     
     def is_near_limit(self, threshold: float = 0.8) -> bool:
         """Check if token usage is near the model's limit.
@@ -214,7 +615,53 @@ class TokenTracker:
         Returns:
             True if usage is above the threshold
         """
-        return (self.session_usage.total_tokens / self.model_config.max_tokens) >= threshold
+        if threshold == 0.8:
+            limit = self._default_threshold_tokens
+        else:
+            limit = self._cached_tokens_for_threshold(threshold)
+        return self.session_usage.total_tokens >= limit
+    
+    def _cached_tokens_for_threshold(self, threshold: float) -> float:
+        """Get the token total for a non-default threshold, via a small LRU."""
+        cache = self._threshold_tokens
+        limit = cache.get(threshold)
+        if limit is not None:
+            cache.move_to_end(threshold)
+            return limit
+        
+        limit = self._tokens_for_threshold(threshold)
+        # NaN keys never match, so caching them would only fill the LRU
+        if threshold == threshold:
+            cache[threshold] = limit
+            if len(cache) > _THRESHOLD_CACHE_SIZE:
+                cache.popitem(last=False)
+        return limit
+    
+    def _tokens_for_threshold(self, threshold: float) -> float:
+        """Get the smallest token total whose usage ratio reaches the threshold."""
+        if not math.isfinite(threshold):
+            # NaN and infinity are never reached, negative infinity always is
+            return 0 if threshold < 0 else math.inf
+        
+        max_tokens = self._max_tokens
+        # Smallest total whose exact ratio reaches the threshold; computed with
+        # fractions, as the float product can be inexact or overflow
+        tokens = math.ceil(Fraction(threshold) * max_tokens)
+        if tokens <= 0 or (tokens - 1) / max_tokens < threshold:
+            return tokens
+        
+        # Smaller totals can round up to the threshold in the float division
+        # `total / max_tokens >= threshold` that the integer compare in
+        # is_near_limit must agree with; past float precision there can be many,
+        # so bisect for the first
+        low, high = 0, tokens - 1
+        while low < high:
+            middle = (low + high) // 2
+            if middle / max_tokens >= threshold:
+                high = middle
+            else:
+                low = middle + 1
+        return high
     
     def get_warning_message(self, threshold: float = 0.8) -> Optional[str]:
         """Get a warning message if near token limit.
@@ -236,10 +683,57 @@ class TokenTracker:
     
     @classmethod
     def list_supported_models(cls) -> List[str]:
-        """Get list of supported model names."""
-        return list(SUPPORTED_MODELS.keys())
+        """Get list of supported model names, including versioned aliases."""
+        return list(SUPPORTED_MODEL_NAMES)
     
     @classmethod
     def get_model_info(cls, model_name: str) -> Optional[ModelConfig]:
         """Get information about a specific model."""
-        return SUPPORTED_MODELS.get(model_name)
\ No newline at end of file
+        return SUPPORTED_MODELS.get(MODEL_ALIASES.get(model_name, model_name))
+
+
+class CompletionStream:
+    """A streamed completion being tracked by a TokenTracker.
+    
+    Created by :meth:`TokenTracker.track_completion_stream`. Chunks passed to
+    :meth:`feed` are buffered, and :meth:`close` (or leaving the ``with``
+    block) tracks the whole completion at once.
+    """
+    
+    def __init__(self, tracker: TokenTracker):
+        """Initialize a stream that reports to the given tracker.
+        
+        Args:
+            tracker: The tracker to add the completion tokens to
+        """
+        self._tracker = tracker
+        self._buffer = io.StringIO()
+        self.usage: Optional[TokenUsage] = None
+    
+    def feed(self, chunk: str) -> None:
+        """Add a chunk of the completion text.
+        
+        Args:
+            chunk: The next piece of the streamed completion
+        """
+        if self.usage is not None:
+            raise ValueError("Cannot feed a closed completion stream")
+        self._buffer.write(chunk)
+    
+    def close(self) -> TokenUsage:
+        """Finish the stream and track the buffered completion.
+        
+        Returns:
+            The tracker's live TokenUsage; see TokenTracker.snapshot()
+        """
+        usage = self.usage
+        if usage is None:
+            usage = self.usage = self._tracker.track_completion(self._buffer.getvalue())
+            self._buffer.close()
+        return usage
+    
+    def __enter__(self) -> "CompletionStream":
+        return self
+    
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()